@@ -18,21 +18,19 @@ from .grist_mock import GristMock
 
 
 def json_load_path(path: Path) -> JSONObject:
-    with open(path, "r") as f:
-        return json.load(f)
+    return json.loads(path.read_bytes())
 
 
 def mock_organizations_file(
     organizations: Iterable[Organization], categories: dict[str, str | None] | None = None
 ) -> Iterable[JSONObject]:
     categories = categories or {}
-    return sorted(
-        [
-            {"id": org.id, "name": org.name, "slug": org.slug, "type": categories.get(org.id)}
-            for org in organizations
-        ],
-        key=itemgetter("name"),
-    )
+    orgs = [
+        {"id": org.id, "name": org.name, "slug": org.slug, "type": categories.get(org.id)}
+        for org in organizations
+    ]
+    orgs.sort(key=itemgetter("name"))
+    return orgs
 
 
 def assert_outputs(
@@ -46,17 +44,18 @@ def assert_outputs(
         for entry in grist_universe
         if entry.object_class is Organization
     }
-    for object_class in Topic.object_classes():
-        objects = universe.objects_of(object_class)
-        orgs = datagouv.owning_organizations(*objects)
-        assert json_load_path(
-            datagouv.config.output_dir / f"organizations-{object_class.namespace()}.json"
-        ) == mock_organizations_file(orgs, categories)
-
-    orgs = uniquify(org for b in (bouquets or []) if (org := b.organization))
-    assert json_load_path(
-        datagouv.config.output_dir / "organizations-bouquets.json"
-    ) == mock_organizations_file(orgs)
+    expected = {
+        f"organizations-{object_class.namespace()}.json": mock_organizations_file(
+            datagouv.owning_organizations(*universe.objects_of(object_class)), categories
+        )
+        for object_class in Topic.object_classes()
+    }
+    expected["organizations-bouquets.json"] = mock_organizations_file(
+        uniquify(org for b in (bouquets or []) if (org := b.organization))
+    )
+
+    output_dir = datagouv.config.output_dir
+    assert {name: json_load_path(output_dir / name) for name in expected} == expected
 
 
 @pytest.fixture
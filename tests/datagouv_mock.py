@@ -1,5 +1,7 @@
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import asdict, dataclass, field
+from dataclasses import fields as dc_fields
+from functools import cache
 from typing import cast
 
 from responses import RequestsMock
@@ -22,12 +24,27 @@ from universe.grist import GristEntry
 from universe.util import JSONObject, uniquify
 
 
-@dataclass(frozen=True)
+# expected X-Fields headers, matching the fields requested by DatagouvApi
+_INACTIVE_FIELDS = ",".join(INACTIVE_OBJECT_MARKERS)
+X_FIELDS_OBJECTS = f"data{{id,{_INACTIVE_FIELDS}}},next_page"
+X_FIELDS_OWNED_OBJECTS = f"data{{id,organization{{id,name,slug}},{_INACTIVE_FIELDS}}},next_page"
+X_FIELDS_TOPIC_ELEMENTS = f"data{{id,element{{id}},{_INACTIVE_FIELDS}}},next_page"
+X_FIELDS_BOUQUETS = (
+    f"data{{id,name,slug,organization{{id,name,slug}},{_INACTIVE_FIELDS}}},next_page"
+)
+
+
+@cache
+def _field_names(object_class: type[DatagouvObject]) -> tuple[str, ...]:
+    return tuple(f.name for f in dc_fields(object_class))
+
+
+@dataclass(frozen=True, slots=True)
 class Proxy[T: DatagouvObject]:
     object: T
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ListProxy[T: DatagouvObject](Proxy[T]):
     children: list[TopicObject] = field(default_factory=list)
 
@@ -39,12 +56,19 @@ class DatagouvMock:
     # _objects is the register of all mocked objects, keyed by object id.
     # proxies keep track of the actual object, and children of those objects when applicable.
     _objects: dict[str, Proxy]
+    # matchers for authenticated requests, shared by all registrations
+    _auth_matcher: Callable[..., tuple[bool, str]]
+    _auth_json_matcher: Callable[..., tuple[bool, str]]
 
     def __init__(self, responses: RequestsMock, config: Config):
         self.responses = responses
         self.config = config
         self._id_counter = 0
         self._objects = {}
+        self._auth_matcher = header_matcher({"X-API-KEY": config.datagouv.token})
+        self._auth_json_matcher = header_matcher(
+            {"Content-Type": "application/json", "X-API-KEY": config.datagouv.token}
+        )
 
     @staticmethod
     def owning_organizations(*objects: Owned) -> Sequence[Organization]:
@@ -119,10 +143,13 @@ class DatagouvMock:
         inclusions = self._leaf_objects(
             *(entry.identifier for entry in grist_universe if not entry.exclude)
         )
-        exclusions = self._leaf_objects(
-            *(entry.identifier for entry in grist_universe if entry.exclude)
-        )
-        objects = [obj for obj in inclusions if obj not in exclusions]
+        excluded_ids = {
+            obj.id
+            for obj in self._leaf_objects(
+                *(entry.identifier for entry in grist_universe if entry.exclude)
+            )
+        }
+        objects = [obj for obj in inclusions if obj.id not in excluded_ids]
         return self.universe(objects)
 
     def mock[T: TopicObject](
@@ -137,13 +164,29 @@ class DatagouvMock:
         # datagouv.delete_all_topic_elements()
         # TODO: support reset=True
 
+        # datagouv.get_organization(), cached across object classes
+        for id in uniquify(
+            entry.identifier for entry in grist_universe if entry.object_class is Organization
+        ):
+            self.mock_get_organization(id)
+
+        entries: dict[type[DatagouvObject], list[str]] = {}
+        for entry in grist_universe:
+            entries.setdefault(entry.object_class, []).append(entry.identifier)
+
         for object_class in Topic.object_classes():
             upcoming_elements = upcoming.elements_of(object_class)
             existing_elements = existing.elements_of(object_class)
 
             # datagouv.get_upcoming_universe_perimeter()
-            for entry in grist_universe:
-                self.mock_get_upcoming_universe_perimeter(entry, object_class)
+            for id in entries.get(object_class, []):
+                self.mock_get_upcoming_universe_perimeter_object(id, object_class)
+            for id in entries.get(Organization, []):
+                self.mock_get_upcoming_universe_perimeter_organization(id, object_class)
+            for id in entries.get(Tag, []):
+                self.mock_get_upcoming_universe_perimeter_tag(id, object_class)
+            for id in entries.get(Topic, []):
+                self.mock_get_upcoming_universe_perimeter_topic(id, object_class)
 
             # datagouv.get_topic_elements()
             self.mock_get_topic_elements(existing_elements, object_class)
@@ -152,13 +195,7 @@ class DatagouvMock:
             upcoming_object_ids = {elem.object.id for elem in upcoming_elements}
 
             # datagouv.put_topic_elements()
-            if additions := sorted(
-                {
-                    elem.object.id
-                    for elem in upcoming_elements
-                    if elem.object.id not in existing_object_ids
-                }
-            ):
+            if additions := sorted(upcoming_object_ids - existing_object_ids):
                 self.mock_put_topic_elements(additions, object_class)
 
             # datagouv.delete_topic_elements()
@@ -170,18 +207,6 @@ class DatagouvMock:
         # datagouv.get_bouquets()
         self.mock_get_bouquets(bouquets or [])
 
-    def mock_get_upcoming_universe_perimeter(
-        self, entry: GristEntry, object_class: type[TopicObject]
-    ) -> None:
-        if entry.object_class in (Dataset, Dataservice) and entry.object_class == object_class:
-            self.mock_get_upcoming_universe_perimeter_object(entry.identifier, object_class)
-        elif entry.object_class is Organization:
-            self.mock_get_upcoming_universe_perimeter_organization(entry.identifier, object_class)
-        elif entry.object_class is Tag:
-            self.mock_get_upcoming_universe_perimeter_tag(entry.identifier, object_class)
-        elif entry.object_class is Topic:
-            self.mock_get_upcoming_universe_perimeter_topic(entry.identifier, object_class)
-
     def mock_get_upcoming_universe_perimeter_object(
         self, id: str, object_class: type[TopicObject]
     ) -> None:
@@ -198,24 +223,26 @@ class DatagouvMock:
             },
         )
 
-    def mock_get_upcoming_universe_perimeter_organization(
-        self, id: str, object_class: type[TopicObject]
-    ) -> None:
+    def mock_get_organization(self, id: str) -> None:
         url = f"{self.config.datagouv.url}/api/1/organizations/{id}/"
         org = self._get_object(id, Organization)
         if not org:
             _ = self.responses.get(url=url, status=404)
             return
-
         _ = self.responses.get(url=url, json=self._as_dict(org, ["id", "name", "slug"]))
 
+    def mock_get_upcoming_universe_perimeter_organization(
+        self, id: str, object_class: type[TopicObject]
+    ) -> None:
+        org = self._get_object(id, Organization)
+        if not org:
+            return
+
         objects = self._leaf_objects_of(org.id, object_class=object_class)
         _ = self.responses.get(
             url=f"{self.config.datagouv.url}/api/2/{object_class.namespace()}/search/",
             match=[
-                header_matcher(
-                    {"X-Fields": f"data{{id,{','.join(INACTIVE_OBJECT_MARKERS)}}},next_page"}
-                ),
+                header_matcher({"X-Fields": X_FIELDS_OBJECTS}),
                 query_param_matcher({"organization": org.id}, strict_match=False),
             ],
             json={
@@ -231,11 +258,7 @@ class DatagouvMock:
         _ = self.responses.get(
             url=f"{self.config.datagouv.url}/api/1/{object_class.namespace()}/",
             match=[
-                header_matcher(
-                    {
-                        "X-Fields": f"data{{id,organization{{id,name,slug}},{','.join(INACTIVE_OBJECT_MARKERS)}}},next_page"
-                    }
-                ),
+                header_matcher({"X-Fields": X_FIELDS_OWNED_OBJECTS}),
                 query_param_matcher({"tag": id}, strict_match=False),
             ],
             json={
@@ -258,11 +281,7 @@ class DatagouvMock:
         _ = self.responses.get(
             url=f"{self.config.datagouv.url}/api/{version}/{object_class.namespace()}/",
             match=[
-                header_matcher(
-                    {
-                        "X-Fields": f"data{{id,organization{{id,name,slug}},{','.join(INACTIVE_OBJECT_MARKERS)}}},next_page"
-                    }
-                ),
+                header_matcher({"X-Fields": X_FIELDS_OWNED_OBJECTS}),
                 query_param_matcher({"topic": id}, strict_match=False),
             ],
             json={
@@ -280,22 +299,16 @@ class DatagouvMock:
     def mock_get_topic_elements(
         self, elements: Iterable[TopicElement], object_class: type[TopicObject]
     ) -> None:
+        model_name = object_class.model_name()
         _ = self.responses.get(
             url=f"{self.config.datagouv.url}/api/2/topics/{self.config.topic}/elements/",
             match=[
-                header_matcher(
-                    {
-                        "X-Fields": f"data{{id,element{{id}},{','.join(INACTIVE_OBJECT_MARKERS)}}},next_page"
-                    }
-                ),
-                query_param_matcher({"class": object_class.model_name()}, strict_match=False),
+                header_matcher({"X-Fields": X_FIELDS_TOPIC_ELEMENTS}),
+                query_param_matcher({"class": model_name}, strict_match=False),
             ],
             json={
                 "data": [
-                    {
-                        "id": elem.id,
-                        "element": {"class": object_class.model_name(), "id": elem.object.id},
-                    }
+                    {"id": elem.id, "element": {"class": model_name, "id": elem.object.id}}
                     for elem in elements
                 ],
                 "next_page": None,
@@ -303,30 +316,24 @@ class DatagouvMock:
         )
 
     def mock_put_topic_elements(
-        self, additions: Iterable[str], object_class: type[TopicObject]
+        self, additions: Sequence[str], object_class: type[TopicObject]
     ) -> None:
         # TODO: support batching
+        model_name = object_class.model_name()
         _ = self.responses.post(
             url=f"{self.config.datagouv.url}/api/2/topics/{self.config.topic}/elements/",
             match=[
-                header_matcher(
-                    {"Content-Type": "application/json", "X-API-KEY": self.config.datagouv.token}
-                ),
+                self._auth_json_matcher,
                 json_params_matcher(
-                    [
-                        {"element": {"class": object_class.model_name(), "id": oid}}
-                        for oid in additions
-                    ]
+                    [{"element": {"class": model_name, "id": oid}} for oid in additions]
                 ),
             ],
         )
 
-    def mock_delete_topic_elements(self, removals: Iterable[str]) -> None:
+    def mock_delete_topic_elements(self, removals: Sequence[str]) -> None:
+        url = f"{self.config.datagouv.url}/api/2/topics/{self.config.topic}/elements"
         for eid in removals:
-            _ = self.responses.delete(
-                url=f"{self.config.datagouv.url}/api/2/topics/{self.config.topic}/elements/{eid}/",
-                match=[header_matcher({"X-API-KEY": self.config.datagouv.token})],
-            )
+            _ = self.responses.delete(url=f"{url}/{eid}/", match=[self._auth_matcher])
 
     def mock_get_bouquets(self, bouquets: Iterable[Topic]) -> None:
         _ = self.responses.get(
@@ -335,7 +342,7 @@ class DatagouvMock:
                 header_matcher(
                     {
                         "X-API-KEY": self.config.datagouv.token,
-                        "X-Fields": f"data{{id,name,slug,organization{{id,name,slug}},{','.join(INACTIVE_OBJECT_MARKERS)}}},next_page",
+                        "X-Fields": X_FIELDS_BOUQUETS,
                     }
                 ),
                 query_param_matcher(
@@ -369,17 +376,13 @@ class DatagouvMock:
         Add object to the _objects register, and register it as child of its declared organization,
         tags and topics.
         """
-        self._objects[object.id] = Proxy(object)
-        if organization:
-            proxy = self._objects[organization.id]
-            assert isinstance(proxy, ListProxy)
-            proxy.children.append(object)
-        for tag in tags or []:
-            proxy = self._objects[tag.id]
-            assert isinstance(proxy, ListProxy)
-            proxy.children.append(object)
-        for topic in topics or []:
-            proxy = self._objects[topic.id]
+        objects = self._objects
+        objects[object.id] = Proxy(object)
+        parent_ids = [organization.id] if organization else []
+        parent_ids.extend(tag.id for tag in tags or [])
+        parent_ids.extend(topic.id for topic in topics or [])
+        for parent_id in parent_ids:
+            proxy = objects[parent_id]
             assert isinstance(proxy, ListProxy)
             proxy.children.append(object)
 
@@ -411,8 +414,10 @@ class DatagouvMock:
     ) -> JSONObject | T:
         if not object:
             return missing
-        d = asdict(object)
         if fields:
-            return {k: v for k, v in d.items() if k in fields}
+            # shallow lookup of the requested fields, asdict() would deep copy nested objects
+            return {
+                name: getattr(object, name) for name in _field_names(type(object)) if name in fields
+            }
         else:
-            return d
+            return asdict(object)
@@ -1,6 +1,13 @@
 import pytest
+import re
+import time
+
+from requests import HTTPError, PreparedRequest
+from responses import RequestsMock
 
 from universe.datagouv import (
+    DELETE_WORKERS,
+    DatagouvApi,
     DatagouvObject,
     Dataservice,
     Dataset,
@@ -61,3 +68,58 @@ class TestOrganization:
 class TestTopic:
     def test_object_classes(self):
         assert set(Topic.object_classes()) == set(TOPIC_OBJECTS)
+
+
+class TestDatagouvApi:
+    URL = "https://www.example.com/datagouv"
+
+    def test_get_object_cached(self, responses: RequestsMock):
+        api = DatagouvApi(self.URL, "datagouv-token")
+        url = f"{self.URL}/api/1/organizations/foo/"
+        _ = responses.get(url=url, json={"id": "foo", "slug": "foo", "name": "Foo"})
+
+        assert api.get_organization("foo") == Organization("foo", "foo", "Foo")
+        assert api.get_organization("foo") == Organization("foo", "foo", "Foo")
+        responses.assert_call_count(url, 1)
+
+    def test_get_object_not_found_cached(self, responses: RequestsMock):
+        api = DatagouvApi(self.URL, "datagouv-token")
+        url = f"{self.URL}/api/1/organizations/foo/"
+        _ = responses.get(url=url, status=404)
+
+        assert api.get_organization("foo") is None
+        assert api.get_organization("foo") is None
+        responses.assert_call_count(url, 1)
+
+    def test_get_object_error_not_cached(self, responses: RequestsMock):
+        api = DatagouvApi(self.URL, "datagouv-token")
+        url = f"{self.URL}/api/1/organizations/foo/"
+        _ = responses.get(url=url, status=503)
+        _ = responses.get(url=url, json={"id": "foo", "slug": "foo", "name": "Foo"})
+
+        assert api.get_organization("foo") is None
+        assert api.get_organization("foo") == Organization("foo", "foo", "Foo")
+        responses.assert_call_count(url, 2)
+
+    def test_delete_topic_elements_stops_on_error(self, responses: RequestsMock):
+        api = DatagouvApi(self.URL, "datagouv-token", fail_on_errors=True)
+
+        def callback(request: PreparedRequest) -> tuple[int, dict[str, str], str]:
+            url = request.url or ""
+            if url.endswith("/element-1/"):
+                return (500, {}, "")
+            # a slow first deletion, and the others still in flight when element-1 fails
+            time.sleep(0.5 if url.endswith("/element-0/") else 0.05)
+            return (204, {}, "")
+
+        responses.add_callback(
+            responses.DELETE,
+            re.compile(rf"{re.escape(self.URL)}/api/2/topics/topic/elements/[^/]+/"),
+            callback=callback,
+        )
+
+        with pytest.raises(HTTPError):
+            api.delete_topic_elements("topic", [f"element-{i}" for i in range(50)])
+        # pending deletions are cancelled on the first error: only those in flight went through,
+        # plus at most one picked up by the failing worker before the error was seen
+        assert len(responses.calls) <= DELETE_WORKERS + 1
@@ -1,3 +1,5 @@
+from responses import RequestsMock
+
 from universe.config import Config
 from universe.datagouv import Organization
 from universe.feed_universe import feed
@@ -145,6 +147,30 @@ def test_unknown_entry(config: Config, datagouv: DatagouvMock, grist: GristMock)
     assert_outputs(datagouv, grist_universe)
 
 
+def test_organization_fetched_once(
+    config: Config, datagouv: DatagouvMock, grist: GristMock, responses: RequestsMock
+):
+    organizations = [datagouv.organization() for _ in range(2)]
+    _ = datagouv.dataset(organization=organizations[0])
+    _ = datagouv.dataservice(organization=organizations[1])
+
+    existing_universe = []
+    grist_universe = [grist.entry(org) for org in organizations]
+    grist_universe.append(grist.raw_entry("unknown", Organization))
+
+    grist.mock(grist_universe)
+    datagouv.mock(existing_universe, grist_universe)
+
+    feed(config)
+
+    assert_outputs(datagouv, grist_universe)
+    # lookups are cached across object classes, including unknown organizations
+    for entry in grist_universe:
+        responses.assert_call_count(
+            f"{config.datagouv.url}/api/1/organizations/{entry.identifier}/", 1
+        )
+
+
 def test_datasets_dataservices_entries(config: Config, datagouv: DatagouvMock, grist: GristMock):
     organizations = [datagouv.organization() for _ in range(4)]
     datasets = [datagouv.dataset(organization=org) for org in organizations[:2]]
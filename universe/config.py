@@ -5,6 +5,11 @@ from pathlib import Path
 import dacite
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 @dataclass
 class DatagouvConfig:
@@ -30,6 +35,6 @@ class Config:
     @staticmethod
     def from_files(*paths: Path) -> "Config":
         assert len(paths) > 0
-        dicts = [yaml.safe_load(path.read_text()) for path in paths]
+        dicts = [yaml.load(path.read_bytes(), Loader=SafeLoader) for path in paths]
         conf = dicts[0] if len(dicts) == 1 else always_merger.merge(*dicts)
         return dacite.from_dict(Config, conf, config=dacite.Config(cast=[Path]))
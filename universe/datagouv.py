@@ -1,10 +1,12 @@
 import inspect
+import json
 import requests
 import sys
 
 from collections.abc import Iterable, Sequence
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from functools import total_ordering
+from functools import cache, lru_cache, total_ordering
 from itertools import batched
 from typing import get_args, Any, Protocol, TypeAlias
 
@@ -23,13 +25,14 @@ from universe.util import (
 session = requests.Session()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DatagouvObject:
     """Base class for datagouv objects."""
 
     id: str
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def class_from_name(name: str) -> type["DatagouvObject"]:
         # Warning: Subclasses should be declared in current file. Otherwise, change lookup scope.
         for clazz_name, clazz in inspect.getmembers(
@@ -49,12 +52,15 @@ class DatagouvObject:
 
 
 class Addressable(Protocol):
+    __slots__ = ()
+
     slug: str | None = None
 
     @classmethod
     def model_name(cls) -> str: ...
 
     @classmethod
+    @cache
     def namespace(cls) -> str:
         """
         API namespace for the model.
@@ -64,7 +70,7 @@ class Addressable(Protocol):
 
 
 @total_ordering
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Organization(DatagouvObject, Addressable):
     slug: str | None = None
     name: str | None = None
@@ -81,27 +87,31 @@ class Organization(DatagouvObject, Addressable):
 
 
 class Owned(Protocol):
+    __slots__ = ()
+
     organization: Organization | None = None
 
 
 class AddressableOwned(Addressable, Owned, Protocol):
-    pass
+    __slots__ = ()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Tag(DatagouvObject):
     pass
 
 
 class Tagged(Protocol):
+    __slots__ = ()
+
     tags: list[str]
 
 
 class AddressableTagged(Addressable, Tagged, Protocol):
-    pass
+    __slots__ = ()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Dataset(DatagouvObject, AddressableOwned, AddressableTagged):
     slug: str | None = None
     title: str | None = None
@@ -109,7 +119,7 @@ class Dataset(DatagouvObject, AddressableOwned, AddressableTagged):
     tags: list[str] = field(default_factory=list)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Dataservice(DatagouvObject, AddressableOwned, AddressableTagged):
     slug: str | None = None
     title: str | None = None
@@ -120,13 +130,13 @@ class Dataservice(DatagouvObject, AddressableOwned, AddressableTagged):
 TopicObject: TypeAlias = Dataset | Dataservice
 
 
-@dataclass
+@dataclass(slots=True)
 class TopicElement[T: TopicObject]:
     id: str
     object: T
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Topic(DatagouvObject, AddressableOwned):
     slug: str | None = None
     name: str | None = None
@@ -134,6 +144,7 @@ class Topic(DatagouvObject, AddressableOwned):
     elements: list[TopicElement] = field(default_factory=list)
 
     @classmethod
+    @cache
     def object_classes(cls) -> tuple[type[TopicObject]]:
         return get_args(TopicObject)
 
@@ -158,6 +169,7 @@ INACTIVE_OBJECT_MARKERS = [
 ]
 
 DEFAULT_PAGE_SIZE = 1000
+DELETE_WORKERS = 8
 
 
 class DatagouvApi:
@@ -168,14 +180,25 @@ class DatagouvApi:
         self.token = token
         self.fail_on_errors = fail_on_errors
         self.dry_run = dry_run
+        # objects don't change during a run, cache lookups shared by all object classes
+        self._objects_cache: dict[tuple[str, type], Any] = {}
         print(f"API for {self.base_url} ready.")
 
     def get_object[T: Addressable](self, id_or_slug: str, object_class: type[T]) -> T | None:
+        key = (id_or_slug, object_class)
+        if key in self._objects_cache:
+            return self._objects_cache[key]
         url = f"{self.base_url}/api/1/{object_class.namespace()}/{id_or_slug}/"
         r = session.get(url)
-        if not r.ok:
+        if r.ok:
+            obj = dacite.from_dict(object_class, r.json())
+        elif r.status_code == 404:
+            obj = None
+        else:
+            # don't cache other failures, they may be transient
             return None
-        return dacite.from_dict(object_class, r.json())
+        self._objects_cache[key] = obj
+        return obj
 
     def get_organization(self, id_or_slug: str) -> Organization | None:
         return self.get_object(id_or_slug, Organization)
@@ -237,24 +260,29 @@ class DatagouvApi:
     ) -> None:
         url = f"{self.base_url}/api/2/topics/{topic_id_or_slug}/elements/"
         headers = {"Content-Type": "application/json", "X-API-KEY": self.token}
+        model_name = object_class.model_name()
         batches = batched(object_ids, batch_size) if batch_size else [object_ids]
         for batch in batches:
-            data = [{"element": {"class": object_class.model_name(), "id": id}} for id in batch]
+            data = [{"element": {"class": model_name, "id": id}} for id in batch]
             if not self.dry_run:
-                session.post(url, json=data, headers=headers).raise_for_status()
+                body = json.dumps(data, separators=(",", ":"))
+                session.post(url, data=body, headers=headers).raise_for_status()
 
     @elapsed
     def delete_topic_elements(self, topic_id_or_slug: str, element_ids: Iterable[str]) -> None:
-        for element_id in element_ids:
-            try:
-                url = f"{self.base_url}/api/2/topics/{topic_id_or_slug}/elements/{element_id}/"
-                headers = {"X-API-KEY": self.token}
-                if not self.dry_run:
-                    session.delete(url, headers=headers).raise_for_status()
-            except requests.HTTPError as e:
-                if self.fail_on_errors:
-                    raise
-                verbose_print(e)
+        # no bulk endpoint for a subset of elements, overlap the individual requests instead
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            futures = [
+                executor.submit(self._delete_topic_element, topic_id_or_slug, element_id)
+                for element_id in element_ids
+            ]
+            # on the first error raised with fail_on_errors, don't issue the pending deletions,
+            # only those already in flight (at most DELETE_WORKERS) complete
+            done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in pending:
+                future.cancel()
+            for future in done:
+                future.result()
 
     @elapsed
     def delete_all_topic_elements(self, topic_id_or_slug: str) -> None:
@@ -290,6 +318,17 @@ class DatagouvApi:
             for d in objs
         ]
 
+    def _delete_topic_element(self, topic_id_or_slug: str, element_id: str) -> None:
+        try:
+            url = f"{self.base_url}/api/2/topics/{topic_id_or_slug}/elements/{element_id}/"
+            headers = {"X-API-KEY": self.token}
+            if not self.dry_run:
+                session.delete(url, headers=headers).raise_for_status()
+        except requests.HTTPError as e:
+            if self.fail_on_errors:
+                raise
+            verbose_print(e)
+
     def _get_objects(
         self,
         url: str,
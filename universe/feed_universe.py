@@ -4,7 +4,8 @@ import os
 import sys
 import time
 
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, KeysView, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -13,8 +14,6 @@ from minicli import cli, run
 from universe.config import Config
 from universe.datagouv import (
     DatagouvApi,
-    Dataservice,
-    Dataset,
     Organization,
     Tag,
     Topic,
@@ -22,17 +21,19 @@ from universe.datagouv import (
 )
 from universe.grist import GristApi, GristEntry
 from universe.util import (
+    set_verbose,
     uniquify,
-    verbose_print,  # noqa: F401
+    verbose_print,
 )
 
 
 ADDITIONS_BATCH_SIZE = 1000
 REMOVALS_THRESHOLD = 1800
+FETCH_WORKERS = 8
 
 
 # LATER: drop along with GristEntry.category
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CategorizedOrganization(Organization):
     category: str | None = None
     __eq__ = Organization.__eq__
@@ -48,7 +49,7 @@ class Perimeter:
         self._exclusions = set()
 
     @property
-    def ids(self) -> Sequence[str]:
+    def ids(self) -> KeysView[str]:
         return self.objects.keys()
 
     @property
@@ -61,18 +62,16 @@ class Perimeter:
 
     def include(
         self,
-        objects: TopicObject | Sequence[TopicObject],
+        objects: Iterable[TopicObject],
         override_organization: Organization | None = None,
     ) -> None:
-        objs = objects if isinstance(objects, Sequence) else [objects]
         if override_organization:
-            self._inclusions |= {obj.id: override_organization for obj in objs}
+            self._inclusions.update((obj.id, override_organization) for obj in objects)
         else:
-            self._inclusions |= {obj.id: obj.organization for obj in objs}
+            self._inclusions.update((obj.id, obj.organization) for obj in objects)
 
-    def exclude(self, objects: TopicObject | Sequence[TopicObject]) -> None:
-        objs = objects if isinstance(objects, Sequence) else [objects]
-        self._exclusions |= {obj.id for obj in objs}
+    def exclude(self, objects: Iterable[TopicObject]) -> None:
+        self._exclusions.update(obj.id for obj in objects)
 
 
 def write_organizations_file(filepath: Path, organizations: list[Organization]):
@@ -92,62 +91,93 @@ def write_organizations_file(filepath: Path, organizations: list[Organization]):
         json.dump(orgs, f, indent=2, ensure_ascii=False)
 
 
+def get_perimeter_entries(
+    grist_entries: Sequence[GristEntry],
+) -> dict[type[TopicObject], Sequence[GristEntry]]:
+    """
+    Select, for each topic object class, the grist entries contributing to its perimeter.
+    Dataset and dataservice entries only apply to their own class, other entries apply to all.
+    Entries keep their original order, so that later entries still take precedence.
+    """
+    return {
+        object_class: [
+            entry
+            for entry in grist_entries
+            if entry.object_class is object_class
+            or entry.object_class not in Topic.object_classes()
+        ]
+        for object_class in Topic.object_classes()
+    }
+
+
+def get_entry_objects(
+    datagouv: DatagouvApi,
+    entry: GristEntry,
+    object_class: type[TopicObject],
+) -> tuple[Sequence[TopicObject], Organization | None] | None:
+    """
+    Fetch the objects of `object_class` referenced by a grist entry, along with the organization
+    they should be attributed to when it differs from their own.
+    Return None if the entry doesn't match any datagouv object.
+    """
+    verbose_print(
+        f"Fetching {object_class.namespace()} for {entry.object_class.model_name()} {entry.identifier}..."
+    )
+    if entry.object_class is object_class:
+        obj = datagouv.get_object(entry.identifier, entry.object_class)
+        if not obj:
+            print(f"Unknown {entry.object_class.model_name()} {entry.identifier}", file=sys.stderr)
+            return None
+        return [obj], None
+
+    elif entry.object_class is Organization:
+        org = datagouv.get_organization(entry.identifier)
+        if not org:
+            print(f"Unknown {entry.object_class.model_name()} {entry.identifier}", file=sys.stderr)
+            return None
+        objs = datagouv.get_organization_objects(org.id, object_class)
+        org = CategorizedOrganization(
+            id=org.id, slug=org.slug, name=org.name, category=entry.category
+        )
+        return objs, org
+
+    elif entry.object_class is Tag:
+        return datagouv.get_tagged_objects(entry.identifier, object_class), None
+
+    elif entry.object_class is Topic:
+        return datagouv.get_topic_objects(entry.identifier, object_class), None
+
+    else:
+        return None
+
+
 def get_upcoming_universe_perimeter(
     datagouv: DatagouvApi,
-    grist_entries: Iterable[GristEntry],
+    grist_entries: Sequence[GristEntry],
     object_class: type[TopicObject],
 ) -> Perimeter:
     perimeter = Perimeter()
 
-    for entry in grist_entries:
-        verbose_print(
-            f"Fetching {object_class.namespace()} for {entry.object_class.model_name()} {entry.identifier}..."
-        )
-
-        if entry.object_class in (Dataset, Dataservice) and entry.object_class is object_class:
-            obj = datagouv.get_object(entry.identifier, entry.object_class)
-            if not obj:
-                print(
-                    f"Unknown {entry.object_class.model_name()} {entry.identifier}", file=sys.stderr
-                )
-                continue
-            if entry.exclude:
-                perimeter.exclude(obj)
-            else:
-                perimeter.include(obj)
-
-        elif entry.object_class is Organization:
-            org = datagouv.get_organization(entry.identifier)
-            if not org:
-                print(
-                    f"Unknown {entry.object_class.model_name()} {entry.identifier}", file=sys.stderr
-                )
-                continue
-            objs = datagouv.get_organization_objects(org.id, object_class)
-            if entry.exclude:
-                perimeter.exclude(objs)
-            else:
-                org = CategorizedOrganization(
-                    id=org.id, slug=org.slug, name=org.name, category=entry.category
-                )
-                perimeter.include(objs, override_organization=org)
-
-        elif entry.object_class is Tag:
-            objs = datagouv.get_tagged_objects(entry.identifier, object_class)
-            if entry.exclude:
-                perimeter.exclude(objs)
-            else:
-                perimeter.include(objs)
-
-        elif entry.object_class is Topic:
-            objs = datagouv.get_topic_objects(entry.identifier, object_class)
-            if entry.exclude:
-                perimeter.exclude(objs)
-            else:
-                perimeter.include(objs)
-
-        else:
-            continue
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        futures = [
+            executor.submit(get_entry_objects, datagouv, entry, object_class)
+            for entry in grist_entries
+        ]
+
+        # apply results in grist order, so that later entries still take precedence
+        try:
+            for entry, future in zip(grist_entries, futures):
+                if (result := future.result()) is None:
+                    continue
+                objs, organization = result
+                if entry.exclude:
+                    perimeter.exclude(objs)
+                else:
+                    perimeter.include(objs, override_organization=organization)
+        except BaseException:
+            # don't run the pending fetches before surfacing the error
+            executor.shutdown(cancel_futures=True)
+            raise
 
     return perimeter
 
@@ -170,9 +200,7 @@ def feed_universe(
     :reset: Empty topic before refeeding it
     :verbose: Enable verbose mode
     """
-    global verbose_print
-    if verbose:
-        verbose_print = print
+    set_verbose(verbose)
 
     conf = Config.from_files(universe, *extra_configs)
 
@@ -217,6 +245,7 @@ def feed(
         verbose_print("Fetching grist universe definition...")
         grist_entries = grist.get_entries()
         print(f"Found {len(grist_entries)} entries in grist.")
+        perimeter_entries = get_perimeter_entries(grist_entries)
 
         if reset:
             print("Removing ALL elements from topic...")
@@ -225,22 +254,26 @@ def feed(
         for object_class in Topic.object_classes():
             verbose_print(f"Fetching upcoming {object_class.namespace()}...")
             upcoming_perimeter = get_upcoming_universe_perimeter(
-                datagouv, grist_entries, object_class
+                datagouv, perimeter_entries[object_class], object_class
             )
+            upcoming_object_ids = upcoming_perimeter.ids
             print(
-                f"Found {len(upcoming_perimeter.ids)} {object_class.namespace()} matching the upcoming universe."
+                f"Found {len(upcoming_object_ids)} {object_class.namespace()} matching the upcoming universe."
             )
 
             verbose_print(f"Fetching existing {object_class.namespace()}...")
-            existing_elements = datagouv.get_topic_elements(conf.topic, object_class)
-            existing_object_ids = uniquify(e.object.id for e in existing_elements)
+            # the same object may be referenced by several elements, keep track of all of them
+            existing_element_ids: dict[str, list[str]] = {}
+            for e in datagouv.get_topic_elements(conf.topic, object_class):
+                existing_element_ids.setdefault(e.object.id, []).append(e.id)
+            existing_object_ids = existing_element_ids.keys()
             print(
                 f"Found {len(existing_object_ids)} {object_class.namespace()} currently in the universe."
             )
 
             verbose_print("Computing topic updates...")
-            additions = sorted(set(upcoming_perimeter.ids) - set(existing_object_ids))
-            removals = sorted(set(existing_object_ids) - set(upcoming_perimeter.ids))
+            additions = sorted(upcoming_object_ids - existing_object_ids)
+            removals = sorted(existing_object_ids - upcoming_object_ids)
             if (n := len(removals)) > REMOVALS_THRESHOLD:
                 raise Exception(f"Too many removals ({n} > {REMOVALS_THRESHOLD}), aborting.")
 
@@ -249,7 +282,7 @@ def feed(
             datagouv.put_topic_elements(conf.topic, object_class, additions, ADDITIONS_BATCH_SIZE)
 
             print(f"- Deleting {len(removals)} {object_class.namespace()}...")
-            element_ids = [e.id for e in existing_elements if e.object.id in removals]
+            element_ids = [eid for oid in removals for eid in existing_element_ids[oid]]
             datagouv.delete_topic_elements(conf.topic, element_ids)
 
             write_organizations_file(
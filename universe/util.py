@@ -1,8 +1,8 @@
 import functools
-import time
 import unicodedata
 
 from collections.abc import Iterable, Mapping, Sequence
+from time import perf_counter
 from types import FunctionType
 from typing import Any, Callable
 
@@ -10,6 +10,8 @@ from typing import Any, Callable
 # weak mapping to avoid having to cast nested json
 JSONObject = Mapping[str, Any]
 
+_verbose = False
+
 
 def elapsed_and_count[T, **P](func: Callable[P, T]) -> Callable[P, T]:
     # https://docs.astral.sh/ty/reference/typing-faq/#why-does-ty-say-callable-has-no-attribute-__name__
@@ -17,14 +19,14 @@ def elapsed_and_count[T, **P](func: Callable[P, T]) -> Callable[P, T]:
 
     @functools.wraps(func)
     def wrapper_decorator(*args, **kwargs):
-        t = time.time()
+        t = perf_counter()
         val = None
         try:
             val = func(*args, **kwargs)
         finally:
-            verbose_print(
-                f"<{func.__name__}: count={len(val or [])}, elapsed={time.time() - t:.2f}s>"
-            )
+            if _verbose:
+                count = len(val) if val is not None else 0
+                print(f"<{func.__name__}: count={count}, elapsed={perf_counter() - t:.2f}s>")
         return val
 
     return wrapper_decorator
@@ -35,16 +37,18 @@ def elapsed[T, **P](func: Callable[P, T]) -> Callable[P, T]:
 
     @functools.wraps(func)
     def wrapper_decorator(*args: P.args, **kwargs: P.kwargs) -> T:
-        t = time.time()
+        t = perf_counter()
         try:
             val = func(*args, **kwargs)
         finally:
-            verbose_print(f"<{func.__name__}: elapsed={time.time() - t:.2f}s>")
+            if _verbose:
+                print(f"<{func.__name__}: elapsed={perf_counter() - t:.2f}s>")
         return val
 
     return wrapper_decorator
 
 
+@functools.lru_cache(maxsize=8192)
 def normalize_string(string: str) -> str:
     """Return NFKD-normalized, ascii-folded, lowercased form of the input string"""
     return unicodedata.normalize("NFKD", string).encode("ascii", "ignore").decode("ascii").lower()
@@ -55,6 +59,12 @@ def uniquify[T](iterable: Iterable[T]) -> Sequence[T]:
     return list(dict.fromkeys(iterable))
 
 
-# noop unless args.verbose is set
+# noop unless verbose mode is enabled with set_verbose()
 def verbose_print(*args, **kwargs):
-    return None
+    if _verbose:
+        print(*args, **kwargs)
+
+
+def set_verbose(verbose: bool) -> None:
+    global _verbose
+    _verbose = verbose